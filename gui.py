@@ -6,15 +6,17 @@ Run with:
     streamlit run gui.py
 """
 
+import asyncio
 import io
-import json
+import weakref
 import pandas as pd
 import streamlit as st
 from datetime import datetime, timezone
 from typing import List, Dict, Any
 
-# Import the package helper that provides a synchronous wrapper
-import port_scanner
+# Import the async scan entrypoint and helpers from the port_scanner package
+from port_scanner.scanner import scan_columns, use_uvloop
+from port_scanner.utils import parse_ports_spec, dumps_json, results_from_columns, DEFAULT_PORTS_SPEC
 
 st.set_page_config(page_title="Mini Port & Service Scanner", layout="wide")
 
@@ -38,7 +40,7 @@ target = st.sidebar.text_input("Target (IP or domain)", value=default_target)
 
 ports_input = st.sidebar.text_input(
     "Ports (CSV / ranges). Examples: 22,80,443  or  1-1024  or leave blank for top ports",
-    value=",".join(map(str, port_scanner.TOP_TCP_PORTS)),
+    value=DEFAULT_PORTS_SPEC,
 )
 
 timeout = st.sidebar.number_input("TCP connect timeout (seconds)", min_value=0.1, value=3.0, step=0.1)
@@ -46,58 +48,57 @@ concurrency = st.sidebar.number_input("Max concurrency", min_value=1, value=200,
 only_open = st.sidebar.checkbox("Show only open ports in table", value=True)
 output_prefix = st.sidebar.text_input("Output filename prefix (optional)", value="scan")
 
-# Helper: parse ports input (same logic as scanner.parse_ports)
-def parse_ports_input(s: str) -> List[int]:
-    if not s or s.strip() == "":
-        return list(port_scanner.TOP_TCP_PORTS)
-    parts = [p.strip() for p in s.split(",") if p.strip()]
-    ports = set()
-    for part in parts:
-        if "-" in part:
-            try:
-                start, end = part.split("-", 1)
-                start_i = int(start)
-                end_i = int(end)
-                ports.update(range(start_i, end_i + 1))
-            except Exception:
-                continue
-        else:
-            try:
-                ports.add(int(part))
-            except Exception:
-                continue
-    return sorted([p for p in ports if 1 <= p <= 65535])
+class _SessionLoop:
+    """Owns one session's event loop and closes it when the session is dropped."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        # st.session_state itself is a process-wide proxy, so the finalizer
+        # hangs off this per-session object; it must not reference `self`
+        weakref.finalize(self, self.loop.close)
+
+
+# One event loop per browser session, reused across scans instead of
+# letting asyncio.run() build and tear down a fresh loop on every click
+if "session_loop" not in st.session_state:
+    use_uvloop()
+    st.session_state.session_loop = _SessionLoop()
 
 # Action
 col1, col2 = st.columns([3, 1])
 with col1:
     if st.button("Start scan", key="start"):
         # Parse ports
-        ports = parse_ports_input(ports_input)
+        ports = parse_ports_spec(ports_input)
         st.info(f"Starting scan of **{target}** — {len(ports)} ports. Timeout={timeout}s, concurrency={concurrency}")
         # Run the scan inside a spinner
         with st.spinner("Scanning (this may take a few seconds)..."):
             try:
-                results: List[Dict[str, Any]] = port_scanner.run_scan_sync(
-                    target=target, ports=ports, timeout=timeout, concurrency=concurrency
+                columns: Dict[str, List[Any]] = st.session_state.session_loop.loop.run_until_complete(
+                    scan_columns(target, ports, timeout, int(concurrency))
                 )
             except Exception as exc:
                 st.error(f"Scan failed: {exc}")
-                results = []
+                columns = {}
 
         # Post-process results into DataFrame
-        if not results:
+        if not columns.get("port"):
             st.warning("No results returned. Check target/permissions and try again.")
         else:
             # attach metadata
             scanned_at = datetime.now(timezone.utc).isoformat()
             meta = {"target": target, "scanned_at": scanned_at, "ports_scanned": len(ports)}
-            st.success(f"Scan finished — {len([r for r in results if r['status']=='open'])} open ports found")
-
-            df = pd.DataFrame(results)
-            # Normalize banner -> safe string
-            df["banner"] = df["banner"].fillna("").astype(str).str.replace("\r", " ", regex=False).str.replace("\n", " ", regex=False)
-            df["service"] = df["service"].fillna("")
+            st.success(f"Scan finished — {columns['status'].count('open')} open ports found")
+
+            # Build the DataFrame straight from the result columns, normalizing
+            # banner -> safe string and service -> ""; `columns` itself stays
+            # untouched for the JSON export
+            df = pd.DataFrame({
+                "port": columns["port"],
+                "status": columns["status"],
+                "banner": [(b or "").replace("\r", " ").replace("\n", " ") for b in columns["banner"]],
+                "service": [svc or "" for svc in columns["service"]],
+            })
 
             # Optionally filter to only open ports
             display_df = df[df["status"] == "open"] if only_open else df
@@ -112,9 +113,9 @@ with col1:
 
             json_payload = {
                 "meta": meta,
-                "results": results
+                "results": results_from_columns(columns)
             }
-            json_bytes = json.dumps(json_payload, indent=2, ensure_ascii=False).encode("utf-8")
+            json_bytes = dumps_json(json_payload)
 
             timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
             json_name = f"{output_prefix}_{timestamp}.json"
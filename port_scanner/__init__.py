@@ -52,13 +52,16 @@ def run_scan_sync(
         timeout: TCP connect timeout in seconds.
         concurrency: maximum concurrent connections.
 
+    Uses uvloop as the event loop when it is installed (non-Windows).
+
     Returns:
         List[dict] - scan results (each dict contains port, status, service, banner)
     """
-    from .scanner import run_scan  # lazy import
+    from .scanner import run_scan, use_uvloop  # lazy import
     import asyncio
 
     if ports is None:
         ports = list(TOP_TCP_PORTS)
 
+    use_uvloop()
     return asyncio.run(run_scan(target, ports, timeout, concurrency))
@@ -0,0 +1,199 @@
+"""
+Optional io_uring backend for port_scanner (Linux only).
+
+Submits a whole window of TCP connect probes with a single io_uring_enter()
+instead of paying a socket/connect/epoll round-trip per port through asyncio.
+Open ports get a follow-up RECV on the same ring for banner grabbing.
+Sockets go through a registered file table (IOSQE_FIXED_FILE) whose slots
+are reused, and cleared, batch by batch.
+
+Requires the `liburing` Python binding (pinned by the `uring` extra). When it
+is missing, lacks the API used here, or on non-Linux platforms, AVAILABLE is
+False and run_scan uses the asyncio path instead.
+"""
+import select
+import socket
+import sys
+from typing import List, Dict
+
+try:
+    import liburing
+except ImportError:  # optional dependency
+    liburing = None
+
+from .utils import NO_BANNER_PORTS, HTTP_PROBE_PORTS, HTTP_PROBE
+
+# Binding API this module relies on; other liburing releases use other names.
+_REQUIRED = (
+    "Ring", "Cqe", "CqeIter", "FileIndex", "Sockaddr", "timespec",
+    "IORING_SETUP_SINGLE_ISSUER", "IOSQE_IO_LINK", "IOSQE_FIXED_FILE",
+    "io_uring_queue_init", "io_uring_queue_exit", "io_uring_get_sqe", "io_uring_submit",
+    "io_uring_cq_ready", "io_uring_cq_advance", "io_uring_sqe_set_flags", "io_uring_sqe_set_data64",
+    "io_uring_prep_connect", "io_uring_prep_recv", "io_uring_prep_send", "io_uring_prep_link_timeout",
+    "io_uring_register_files_sparse", "io_uring_register_files_update",
+)
+
+AVAILABLE = (
+    sys.platform == "linux"
+    and liburing is not None
+    and all(hasattr(liburing, name) for name in _REQUIRED)
+    and hasattr(liburing.Ring, "ring_fd")
+)
+
+# Every probe uses two SQEs (operation + linked timeout), so a full batch
+# submits ~1024 SQEs per io_uring_enter(). HTTP probes add a SEND in front
+# of the banner RECV, so the ring is sized for three SQEs per probe.
+MAX_BATCH = 512
+_SQES_PER_PROBE = 3
+BANNER_TIMEOUT = 0.8
+BANNER_SIZE = 256
+
+# Low two bits of user_data tag the operation; the rest is the batch index.
+_OP_CONNECT = 0
+_OP_RECV = 1
+_OP_TIMEOUT = 2
+_OP_SEND = 3
+
+def _open_ring(entries: int):
+    ring = liburing.Ring()
+    # DEFER_TASKRUN is left out on purpose: deferred completions only run
+    # inside io_uring_enter(), so poll() on the ring fd (see _reap) would not
+    # wake up for them.
+    try:
+        liburing.io_uring_queue_init(entries, ring, liburing.IORING_SETUP_SINGLE_ISSUER)
+    except OSError:
+        # kernels older than 6.0 reject this setup flag
+        liburing.io_uring_queue_init(entries, ring, 0)
+    return ring
+
+
+def _prep_linked(ring, prep, args, index: int, op: int, timeout_ts) -> None:
+    """
+    Queue `prep(sqe, *args)` followed by a linked timeout SQE.
+    The fd argument of `prep` is an index into the registered file table.
+    """
+    sqe = liburing.io_uring_get_sqe(ring)
+    prep(sqe, *args)
+    liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_IO_LINK | liburing.IOSQE_FIXED_FILE)
+    liburing.io_uring_sqe_set_data64(sqe, index << 2 | op)
+
+    sqe = liburing.io_uring_get_sqe(ring)
+    liburing.io_uring_prep_link_timeout(sqe, timeout_ts, 0)
+    liburing.io_uring_sqe_set_data64(sqe, index << 2 | _OP_TIMEOUT)
+
+
+def _reap(ring, cqe, expected: int) -> Dict[int, int]:
+    """
+    Drain `expected` completions. Returns {batch index: res} for the
+    connect/recv operations (-1 for any failure); send and linked-timeout
+    completions are discarded.
+    """
+    done = {}
+    seen = 0
+    poller = select.poll()
+    poller.register(ring.ring_fd, select.POLLIN)
+    while seen < expected:
+        if not liburing.io_uring_cq_ready(ring):
+            # Block in poll(), which releases the GIL; the binding's
+            # io_uring_wait_cqe() holds it and would stall every other thread.
+            poller.poll()
+            continue
+        count = 0
+        for _ in liburing.CqeIter(ring, cqe):
+            entry = cqe[0]
+            user_data = entry.user_data
+            if user_data & 3 in (_OP_CONNECT, _OP_RECV):
+                try:
+                    res = entry.res
+                except OSError:  # the binding raises for negative (errno) results
+                    res = -1
+                done[user_data >> 2] = res
+            count += 1
+        liburing.io_uring_cq_advance(ring, count)
+        seen += count
+    return done
+
+
+def _scan_batch(ring, cqe, ip: str, family: int, ports: List[int], connect_ts, banner_ts, columns, offset: int) -> None:
+    """Probe one window of `ports`, filling `columns` from slot `offset` on."""
+    socks = [socket.socket(family, socket.SOCK_STREAM | socket.SOCK_NONBLOCK) for _ in ports]
+    try:
+        # slot i of the registered table now refers to socks[i]
+        fds = liburing.FileIndex([sock.fileno() for sock in socks])
+        liburing.io_uring_register_files_update(ring, fds, 0)
+        # built per batch (not shared across scans) so concurrent GUI sessions
+        # cannot see each other's targets; kept alive until the connects complete
+        addrs = [liburing.Sockaddr(family, ip, port) for port in ports]
+        for i in range(len(socks)):
+            _prep_linked(ring, liburing.io_uring_prep_connect, (i, addrs[i]), i, _OP_CONNECT, connect_ts)
+        liburing.io_uring_submit(ring)
+        connected = _reap(ring, cqe, 2 * len(ports))
+
+        opened = [i for i, res in connected.items() if res == 0]
+        buffers = {}
+        received = {}
+        sends = 0
+        for i in opened:
+            if ports[i] in NO_BANNER_PORTS:
+                continue
+            if ports[i] in HTTP_PROBE_PORTS:
+                # SEND -> RECV -> timeout chain; a failed send cancels the recv
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_send(sqe, i, HTTP_PROBE, 0)
+                liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_IO_LINK | liburing.IOSQE_FIXED_FILE)
+                liburing.io_uring_sqe_set_data64(sqe, i << 2 | _OP_SEND)
+                sends += 1
+            buffers[i] = bytearray(BANNER_SIZE)
+            _prep_linked(
+                ring, liburing.io_uring_prep_recv,
+                (i, buffers[i], 0), i, _OP_RECV, banner_ts,
+            )
+        if buffers:
+            liburing.io_uring_submit(ring)
+            received = _reap(ring, cqe, 2 * len(buffers) + sends)
+
+        for i in opened:
+            banner = None
+            nbytes = received.get(i, 0)
+            if nbytes > 0:
+                banner = bytes(buffers[i][:nbytes]).decode(errors="ignore").strip() or None
+            columns["status"][offset + i] = "open"
+            columns["banner"][offset + i] = banner
+    finally:
+        # the table holds its own reference to each socket; drop it so
+        # connections close now rather than when the slot is next reused
+        liburing.io_uring_register_files_update(ring, liburing.FileIndex([-1] * len(socks)), 0)
+        for sock in socks:
+            sock.close()
+
+
+def scan(ip: str, ports: List[int], timeout: float, concurrency: int) -> Dict[str, list]:
+    """
+    Blocking io_uring scan of `ports` (sorted) on an already resolved `ip`.
+    At most `concurrency` probes are in flight at once.
+    Returns columnar results like scanner.scan_columns, with the service
+    column left empty for the caller to fill.
+    Raises OSError if the ring cannot be created (e.g. io_uring disabled).
+    """
+    family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+    batch = max(1, min(concurrency, MAX_BATCH))
+    ring = _open_ring(_SQES_PER_PROBE * batch)
+    cqe = liburing.Cqe()
+    # timespec objects must stay referenced until their SQEs complete
+    connect_ts = liburing.timespec(timeout)
+    banner_ts = liburing.timespec(BANNER_TIMEOUT)
+
+    columns = {
+        "port": list(ports),
+        "status": ["closed"] * len(ports),
+        "banner": [None] * len(ports),
+        "service": [None] * len(ports),
+    }
+    try:
+        liburing.io_uring_register_files_sparse(ring, batch)
+        for start in range(0, len(ports), batch):
+            _scan_batch(ring, cqe, ip, family, ports[start:start + batch], connect_ts, banner_ts, columns, start)
+    finally:
+        # tearing down the ring also releases the registered file table
+        liburing.io_uring_queue_exit(ring)
+    return columns
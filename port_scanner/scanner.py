@@ -11,102 +11,161 @@ Basic features:
 import argparse
 import asyncio
 import socket
-from datetime import datetime
-from typing import List, Dict, Optional
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Tuple
 
-from .utils import resolve_target, TOP_TCP_PORTS, save_json, save_csv, infer_service
+from .utils import (
+    resolve_target, save_json, save_csv, infer_services_batch, parse_ports_spec, results_from_columns,
+    NO_BANNER_PORTS, HTTP_PROBE_PORTS, HTTP_PROBE,
+)
+from . import _uring
 
 DEFAULT_TIMEOUT = 3.0
 DEFAULT_CONCURRENCY = 500
 
 
-async def try_connect(ip: str, port: int, timeout: float) -> Optional[asyncio.StreamReader]:
+def use_uvloop() -> None:
     """
-    Try to open TCP connection to (ip, port). Return (reader) on success, None on failure.
+    Make asyncio use uvloop's event loop when the optional `uvloop` package
+    is installed. No-op on Windows (unsupported) or when it is missing.
     """
+    if sys.platform == "win32":
+        return
     try:
-        conn = asyncio.open_connection(ip, port)
-        reader, writer = await asyncio.wait_for(conn, timeout=timeout)
-        # Don't close writer here — let caller handle it after banner.
-        return reader, writer
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+async def try_connect(ip: str, port: int, timeout: float) -> Optional[socket.socket]:
+    """
+    Try to open TCP connection to (ip, port). Return the connected non-blocking
+    socket on success, None on failure.
+    """
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+    sock = None
+    try:
+        # created inside the try so running out of fds (EMFILE) is a closed port
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout=timeout)
+        # Don't close the socket here — let caller handle it after banner.
+        return sock
     except (asyncio.TimeoutError, ConnectionRefusedError, OSError):
+        if sock is not None:
+            sock.close()
         return None
 
 
-async def grab_banner(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, timeout: float) -> Optional[str]:
+async def grab_banner(sock: socket.socket, timeout: float, probe: Optional[bytes] = None) -> Optional[str]:
     """
     Attempt to read a small banner non-intrusively.
-    We set a read timeout and read up to N bytes.
+    If `probe` is given it is sent first to prompt a reply.
+    We set a read timeout and read up to N bytes. Always closes `sock`.
     """
+    loop = asyncio.get_running_loop()
     try:
+        if probe:
+            await asyncio.wait_for(loop.sock_sendall(sock, probe), timeout=timeout)
         # Some services only send banner after connecting; others don't.
-        data = await asyncio.wait_for(reader.read(256), timeout=timeout)
+        data = await asyncio.wait_for(loop.sock_recv(sock, 256), timeout=timeout)
         if data:
             return data.decode(errors="ignore").strip()
         else:
             return None
-    except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+    except (asyncio.TimeoutError, OSError):
         return None
     finally:
-        try:
-            writer.close()
-            await writer.wait_closed()
-        except Exception:
-            pass
+        sock.close()
 
 
-async def scan_port(semaphore: asyncio.Semaphore, ip: str, port: int, timeout: float) -> Dict:
+async def scan_port(ip: str, port: int, timeout: float) -> Tuple[int, str, Optional[str]]:
     """
-    Scan a single port with concurrency control.
-    Returns a dict with port, status, banner, inferred_service
+    Scan a single port.
+    Returns a (port, status, banner) tuple; services are inferred afterwards
+    for all open ports at once (see scan_columns).
     """
-    async with semaphore:
-        result = {"port": port, "status": "closed", "banner": None, "service": None}
-        conn = await try_connect(ip, port, timeout)
-        if conn:
-            reader, writer = conn
-            result["status"] = "open"
-            banner = await grab_banner(reader, writer, timeout=0.8)  # small additional timeout for banner
-            result["banner"] = banner
-            result["service"] = infer_service(port, banner)
-        return result
+    sock = await try_connect(ip, port, timeout)
+    if not sock:
+        return port, "closed", None
+    if port in NO_BANNER_PORTS:
+        sock.close()
+        banner = None
+    else:
+        probe = HTTP_PROBE if port in HTTP_PROBE_PORTS else None
+        banner = await grab_banner(sock, timeout=0.8, probe=probe)  # small additional timeout for banner
+    return port, "open", banner
+
+
+async def _scan_asyncio(ip: str, ordered: List[int], timeout: float, concurrency: int) -> Dict[str, list]:
+    """Probe the sorted `ordered` ports with asyncio; the service column is left empty."""
+    # A fixed pool of `concurrency` workers drains the port queue, so there
+    # is one task per worker rather than one task + semaphore wait per port.
+    # Ports are sorted up front and each result lands in its pre-sized slot
+    # of every column, so the output is already ordered by port.
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in enumerate(ordered):
+        queue.put_nowait(item)
+    status: List[str] = ["closed"] * len(ordered)
+    banner: List[Optional[str]] = [None] * len(ordered)
+    service: List[Optional[str]] = [None] * len(ordered)
+
+    async def worker() -> None:
+        while not queue.empty():
+            index, port = queue.get_nowait()
+            _, status[index], banner[index] = await scan_port(ip, port, timeout)
+
+    # clamped like the io_uring backend, so concurrency <= 0 still probes
+    workers = max(1, min(concurrency, len(ordered)))
+    if sys.version_info >= (3, 12):
+        # Eager tasks run until their first suspension as they are created, so
+        # instantly refused connects complete without an event-loop round-trip.
+        # The factory is only swapped while the workers are being created.
+        loop = asyncio.get_running_loop()
+        previous_factory = loop.get_task_factory()
+        async with asyncio.TaskGroup() as tg:
+            loop.set_task_factory(asyncio.eager_task_factory)
+            try:
+                for _ in range(workers):
+                    tg.create_task(worker())
+            finally:
+                loop.set_task_factory(previous_factory)
+    else:
+        await asyncio.gather(*(worker() for _ in range(workers)))
+    return {"port": ordered, "status": status, "banner": banner, "service": service}
 
 
-async def run_scan(target: str, ports: List[int], timeout: float, concurrency: int) -> List[Dict]:
+async def scan_columns(target: str, ports: List[int], timeout: float, concurrency: int) -> Dict[str, list]:
+    """
+    Scan `ports` on `target` and return columnar results sorted by port:
+    {"port": [...], "status": [...], "banner": [...], "service": [...]}
+    """
     ip = resolve_target(target)
-    semaphore = asyncio.Semaphore(concurrency)
-    tasks = [scan_port(semaphore, ip, p, timeout) for p in ports]
-    results = await asyncio.gather(*tasks)
-    return sorted(results, key=lambda r: r["port"])
+    ordered = sorted(ports)
+    columns = None
+    if _uring.AVAILABLE:
+        try:
+            columns = await asyncio.to_thread(_uring.scan, ip, ordered, timeout, concurrency)
+        except OSError:
+            pass  # io_uring unsupported or disabled on this kernel; use asyncio
+    if columns is None:
+        columns = await _scan_asyncio(ip, ordered, timeout, concurrency)
 
+    # classify all open ports in one pass, outside the probe loop
+    opened = [i for i, state in enumerate(columns["status"]) if state == "open"]
+    services = infer_services_batch([columns["port"][i] for i in opened], [columns["banner"][i] for i in opened])
+    for i, svc in zip(opened, services):
+        columns["service"][i] = svc
+    return columns
 
-def parse_ports(ports_arg: Optional[str]) -> List[int]:
-    """
-    Support forms:
-      - None => return TOP_TCP_PORTS (small curated list)
-      - "22,80,443"
-      - "1-1024"
-      - "22-25,80,443"
-    """
-    if not ports_arg:
-        return TOP_TCP_PORTS.copy()
-    ports = set()
-    for part in ports_arg.split(","):
-        part = part.strip()
-        if "-" in part:
-            try:
-                start, end = part.split("-", 1)
-                start_i = int(start)
-                end_i = int(end)
-                ports.update(range(start_i, end_i + 1))
-            except ValueError:
-                continue
-        else:
-            try:
-                ports.add(int(part))
-            except ValueError:
-                continue
-    return sorted(p for p in ports if 1 <= p <= 65535)
+
+async def run_scan(target: str, ports: List[int], timeout: float, concurrency: int) -> List[Dict]:
+    """Like scan_columns, but returns a list of result dicts (port, status, banner, service)."""
+    return results_from_columns(await scan_columns(target, ports, timeout, concurrency))
 
 
 def main():
@@ -119,12 +178,15 @@ def main():
     parser.add_argument("--only-open", action="store_true", help="Show only open ports in CLI output")
     args = parser.parse_args()
 
-    ports = parse_ports(args.ports)
+    # report filename timestamp (UTC, scan start) is computed once and reused
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    ports = parse_ports_spec(args.ports)
 
     print(f"[*] Resolving and scanning {args.target} ({len(ports)} ports) with timeout={args.timeout}s concurrency={args.concurrency}")
-    start = datetime.utcnow()
+    use_uvloop()
+    start_ns = time.perf_counter_ns()
     results = asyncio.run(run_scan(args.target, ports, args.timeout, args.concurrency))
-    duration = (datetime.utcnow() - start).total_seconds()
+    duration = (time.perf_counter_ns() - start_ns) / 1e9
 
     open_ports = [r for r in results if r["status"] == "open"]
 
@@ -137,7 +199,6 @@ def main():
 
     # save reports if requested
     if args.output:
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         json_file = f"{args.output}_{timestamp}.json"
         csv_file = f"{args.output}_{timestamp}.csv"
         save_json(results, json_file)
@@ -145,7 +206,6 @@ def main():
         print(f"\n[+] Reports saved to {json_file} and {csv_file}")
     else:
         # default name
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         save_json(results, f"scan_{timestamp}.json")
         save_csv(results, f"scan_{timestamp}.csv")
         print(f"\n[+] Reports saved to scan_{timestamp}.json and scan_{timestamp}.csv")
@@ -3,8 +3,18 @@ Helper utilities for port_scanner
 """
 import json
 import csv
+import itertools
+import re
 import socket
-from typing import List, Optional
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional dependency; fall back to stdlib json
+    orjson = None
 
 # Curated top TCP ports (small set for quick scans). Expand as needed.
 TOP_TCP_PORTS = [
@@ -12,45 +22,143 @@ TOP_TCP_PORTS = [
     587, 993, 995, 3306, 3389, 5900, 8080
 ]
 
+# TOP_TCP_PORTS as a port spec string (default value of the GUI ports field).
+# Lives here rather than in gui.py because Streamlit re-executes the GUI
+# script on every interaction, while imported modules are evaluated once.
+DEFAULT_PORTS_SPEC = ",".join(map(str, TOP_TCP_PORTS))
+# Open ports whose protocols are client-driven: they never send a greeting,
+# so waiting for a banner only burns the banner timeout.
+NO_BANNER_PORTS = frozenset({443, 445, 3389})
+
+# Plain-HTTP ports get a minimal HEAD request so the server replies with a
+# status line and Server header to use as banner.
+HTTP_PROBE_PORTS = frozenset({80, 8080})
+HTTP_PROBE = b"HEAD / HTTP/1.0\r\n\r\n"
+
+# Read-only view of 65536 set bytes; slicing it fills a range of the
+# parse_ports_spec bitmap without allocating a temporary bytes object.
+_PORT_ONES = memoryview(b"\x01" * 65536)
+
+
+def parse_ports_spec(spec: Optional[str]) -> List[int]:
+    """
+    Parse a port specification into a sorted list of unique ports (1-65535).
+    Support forms:
+      - None / blank => TOP_TCP_PORTS (small curated list)
+      - "22,80,443"
+      - "1-1024"
+      - "22-25,80,443"
+    Malformed parts are skipped.
+    """
+    if not spec or not spec.strip():
+        return list(TOP_TCP_PORTS)
+    # one byte per port number; ranges become a single slice assignment
+    mask = bytearray(65536)
+    for part in spec.split(","):
+        part = part.strip()
+        try:
+            if "-" in part:
+                start, end = part.split("-", 1)
+                start_i = max(int(start), 1)
+                end_i = min(int(end), 65535)
+                if start_i <= end_i:
+                    mask[start_i:end_i + 1] = _PORT_ONES[start_i:end_i + 1]
+            else:
+                port = int(part)
+                if 1 <= port <= 65535:
+                    mask[port] = 1
+        except ValueError:
+            continue
+    return list(itertools.compress(range(65536), mask))
+
+
+# In-process DNS cache: hostname -> (ip, expiry from time.monotonic()).
+# Oldest entries are evicted once the cache grows past _DNS_MAX.
+_DNS_TTL = 60.0
+_DNS_MAX = 1024
+_DNS_CACHE: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
 
 def resolve_target(target: str) -> str:
     """
-    Resolve domain to IPv4 address, or return the IP if already provided.
+    Resolve domain to IPv4 address, or return the IP if already provided
+    (strict IPv4 dotted quad or IPv6 literal).
+    Successful lookups are cached for _DNS_TTL seconds; use
+    resolve_target.cache_clear() to drop them.
     Raises socket.gaierror on failure.
     """
-    try:
-        # allow passing IP directly
-        socket.inet_aton(target)
-        return target
-    except OSError:
-        # not an IPv4 dotted quad - try DNS
-        resolved = socket.getaddrinfo(target, None, family=socket.AF_INET)
-        if not resolved:
-            raise socket.gaierror(f"Could not resolve {target}")
-        return resolved[0][4][0]
+    # allow passing IP directly
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, target)
+            return target
+        except OSError:
+            continue
+
+    now = time.monotonic()
+    cached = _DNS_CACHE.get(target)
+    if cached and now < cached[1]:
+        _DNS_CACHE.move_to_end(target)
+        return cached[0]
+
+    # not an IP literal - try DNS
+    resolved = socket.getaddrinfo(target, None, family=socket.AF_INET)
+    if not resolved:
+        raise socket.gaierror(f"Could not resolve {target}")
+    ip = resolved[0][4][0]
+    _DNS_CACHE[target] = (ip, now + _DNS_TTL)
+    _DNS_CACHE.move_to_end(target)
+    if len(_DNS_CACHE) > _DNS_MAX:
+        _DNS_CACHE.popitem(last=False)
+    return ip
+
+
+resolve_target.cache_clear = _DNS_CACHE.clear
+
+
+# Column order of scan results (matches the key order of result dicts)
+RESULT_FIELDS = ("port", "status", "banner", "service")
+
+
+def results_from_columns(columns: Dict[str, list]) -> List[dict]:
+    """Turn columnar scan results ({field: list}) into a list of result dicts."""
+    return [dict(zip(RESULT_FIELDS, row)) for row in zip(*(columns[f] for f in RESULT_FIELDS))]
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize `obj` to indented UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
 
 
 def save_json(results: List[dict], filename: str):
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    with open(filename, "wb") as f:
+        f.write(dumps_json(results))
+
+
+# CR/LF -> space, so a banner always stays on one CSV row
+_BANNER_TRANS = str.maketrans({"\n": " ", "\r": " "})
 
 
 def save_csv(results: List[dict], filename: str):
     fieldnames = ["port", "status", "service", "banner"]
     with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in results:
-            writer.writerow({
-                "port": r.get("port"),
-                "status": r.get("status"),
-                "service": r.get("service") or "",
-                "banner": (r.get("banner") or "").replace("\n", " ").replace("\r", " ")
-            })
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            (
+                r.get("port"),
+                r.get("status"),
+                r.get("service") or "",
+                (r.get("banner") or "").translate(_BANNER_TRANS),
+            )
+            for r in results
+        )
 
 
 # Basic inference from port number or banner (non-exhaustive)
-SERVICE_MAP = {
+SERVICE_MAP = MappingProxyType({
     21: "ftp",
     22: "ssh",
     23: "telnet",
@@ -64,24 +172,28 @@ SERVICE_MAP = {
     3389: "rdp",
     5900: "vnc",
     8080: "http-alt",
-}
+})
+
+
+# Banner keywords -> service; the group name is the inferred service.
+_BANNER_RE = re.compile(
+    r"(?P<ssh>ssh)|(?P<http>http|apache|nginx)|(?P<smtp>smtp)|(?P<mysql>mysql|mariadb)|(?P<rdp>rdp|mstsc)",
+    re.IGNORECASE,
+)
 
 
 def infer_service(port: int, banner: Optional[str]) -> Optional[str]:
     # try port map first
-    if port in SERVICE_MAP:
-        return SERVICE_MAP[port]
-    # try banner heuristics
+    svc = SERVICE_MAP.get(port)
+    if svc:
+        return svc
+    # try banner heuristics (first keyword found in the banner wins)
     if banner:
-        b = banner.lower()
-        if "ssh" in b:
-            return "ssh"
-        if "http" in b or "apache" in b or "nginx" in b:
-            return "http"
-        if "smtp" in b:
-            return "smtp"
-        if "mysql" in b or "mariadb" in b:
-            return "mysql"
-        if "rdp" in b or "mstsc" in b:
-            return "rdp"
+        m = _BANNER_RE.search(banner)
+        return m.lastgroup if m else None
     return None
+
+
+def infer_services_batch(ports: List[int], banners: List[Optional[str]]) -> List[Optional[str]]:
+    """infer_service over parallel port/banner columns (all open ports after a scan)."""
+    return [infer_service(port, banner) for port, banner in zip(ports, banners)]
@@ -0,0 +1,124 @@
+import socket
+import threading
+
+import pytest
+
+from port_scanner import _uring
+
+
+def _serve(reply=None, expect=None):
+    """
+    Start a one-thread TCP listener on localhost and return its port.
+    Each client gets `reply` (after reading `expect` bytes, if given);
+    with reply=None the connection is held open silently until closed.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+
+    def run():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    if expect is not None:
+                        conn.recv(len(expect))
+                    if reply is not None:
+                        conn.sendall(reply)
+                    conn.recv(1)  # wait for the scanner to hang up
+                except OSError:  # reset when the scanner closes without reading
+                    pass
+
+    threading.Thread(target=run, daemon=True).start()
+    return server, server.getsockname()[1]
+
+
+def _closed_port():
+    """Return a localhost port with nothing listening on it."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def servers():
+    banner, banner_port = _serve(b"SSH-2.0-Test\r\n")
+    quiet, quiet_port = _serve()
+    http, http_port = _serve(b"HTTP/1.0 200 OK\r\nServer: nginx\r\n\r\n", expect=b"HEAD / HTTP/1.0\r\n\r\n")
+    yield {"banner": banner_port, "quiet": quiet_port, "http": http_port, "closed": _closed_port()}
+    for server in (banner, quiet, http):
+        server.close()
+
+
+@pytest.mark.skipif(not _uring.AVAILABLE, reason="liburing binding not installed")
+def test_uring_scan(monkeypatch, servers):
+    monkeypatch.setattr(_uring, "BANNER_TIMEOUT", 0.3)
+    monkeypatch.setattr(_uring, "HTTP_PROBE_PORTS", frozenset({servers["http"]}))
+    ports = sorted(servers.values())
+    try:
+        columns = _uring.scan("127.0.0.1", ports, 1.0, 16)
+    except OSError as exc:
+        pytest.skip(f"io_uring unavailable: {exc}")
+
+    assert columns["port"] == ports
+    result = dict(zip(columns["port"], zip(columns["status"], columns["banner"])))
+    assert result[servers["banner"]] == ("open", "SSH-2.0-Test")
+    assert result[servers["quiet"]] == ("open", None)
+    assert result[servers["http"]] == ("open", "HTTP/1.0 200 OK\r\nServer: nginx")
+    assert result[servers["closed"]] == ("closed", None)
+
+
+def test_scan_clamps_concurrency(monkeypatch, servers):
+    from port_scanner import run_scan_sync
+
+    monkeypatch.setattr(_uring, "AVAILABLE", False)
+    results = run_scan_sync("127.0.0.1", [servers["quiet"]], timeout=1.0, concurrency=0)
+    assert results[0]["status"] == "open"
+
+
+def test_scan_local_listeners(monkeypatch, servers):
+    from port_scanner import run_scan_sync
+
+    monkeypatch.setattr(_uring, "AVAILABLE", False)
+    ports = [servers["closed"], servers["quiet"], servers["banner"]]
+    results = run_scan_sync("127.0.0.1", ports, timeout=1.0, concurrency=8)
+
+    assert [r["port"] for r in results] == sorted(ports)
+    result = {r["port"]: (r["status"], r["banner"]) for r in results}
+    assert result[servers["banner"]] == ("open", "SSH-2.0-Test")
+    assert result[servers["quiet"]] == ("open", None)
+    assert result[servers["closed"]] == ("closed", None)
+
+
+def test_scan_banner_port_rules(monkeypatch, servers):
+    from port_scanner import run_scan_sync, scanner
+
+    monkeypatch.setattr(_uring, "AVAILABLE", False)
+    # the banner server stands in for 443/445/3389, the HTTP one for 80/8080
+    monkeypatch.setattr(scanner, "NO_BANNER_PORTS", frozenset({servers["banner"]}))
+    monkeypatch.setattr(scanner, "HTTP_PROBE_PORTS", frozenset({servers["http"]}))
+    results = run_scan_sync("127.0.0.1", [servers["banner"], servers["http"]], timeout=1.0, concurrency=8)
+
+    result = {r["port"]: (r["status"], r["banner"]) for r in results}
+    assert result[servers["banner"]] == ("open", None)
+    assert result[servers["http"]] == ("open", "HTTP/1.0 200 OK\r\nServer: nginx")
+    assert {r["port"]: r["service"] for r in results}[servers["http"]] == "http"
+
+
+def test_try_connect_out_of_fds(monkeypatch):
+    import asyncio
+    import errno
+    from port_scanner import scanner
+
+    def emfile(*args, **kwargs):
+        raise OSError(errno.EMFILE, "Too many open files")
+
+    async def scan():
+        # patched once the loop is up, so only the probe socket fails
+        monkeypatch.setattr(scanner.socket, "socket", emfile)
+        return await scanner.scan_port("127.0.0.1", 9, 0.5)
+
+    assert asyncio.run(scan()) == (9, "closed", None)
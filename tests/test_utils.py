@@ -22,3 +22,114 @@ def test_save_and_read(tmp_path):
 
     # csv existence is enough for this simple test
     assert csv_file.stat().st_size > 0
+
+
+def test_resolve_target_caches_lookups(monkeypatch):
+    import socket
+    from port_scanner import utils
+
+    calls = []
+
+    def fake_getaddrinfo(host, port, family=0):
+        calls.append(host)
+        return [(family, socket.SOCK_STREAM, 6, "", ("192.0.2.10", 0))]
+
+    utils.resolve_target.cache_clear()
+    monkeypatch.setattr(utils.socket, "getaddrinfo", fake_getaddrinfo)
+
+    assert utils.resolve_target("example.test") == "192.0.2.10"
+    assert utils.resolve_target("example.test") == "192.0.2.10"
+    assert calls == ["example.test"]
+
+    utils.resolve_target.cache_clear()
+    utils.resolve_target("example.test")
+    assert calls == ["example.test", "example.test"]
+    utils.resolve_target.cache_clear()
+
+
+def test_infer_service():
+    from port_scanner.utils import infer_service
+
+    assert infer_service(22, None) == "ssh"
+    assert infer_service(2222, "SSH-2.0-OpenSSH_9.6") == "ssh"
+    assert infer_service(8000, "HTTP/1.1 200 OK\r\nServer: nginx") == "http"
+    assert infer_service(3307, "5.5.5-10.11.6-MariaDB") == "mysql"
+    assert infer_service(2525, "220 mail ESMTP ready") == "smtp"
+    assert infer_service(9999, "hello") is None
+    assert infer_service(9999, None) is None
+
+
+def test_parse_ports_spec():
+    from port_scanner.utils import parse_ports_spec
+
+    assert parse_ports_spec(None) == TOP_TCP_PORTS
+    assert parse_ports_spec("  ") == TOP_TCP_PORTS
+    assert parse_ports_spec("443,22,80,22") == [22, 80, 443]
+    assert parse_ports_spec("20-25, 80") == [20, 21, 22, 23, 24, 25, 80]
+    assert parse_ports_spec("0-3,65534-70000") == [1, 2, 3, 65534, 65535]
+    assert parse_ports_spec("abc,10-x,0,70000,7") == [7]
+    assert len(parse_ports_spec("1-65535")) == 65535
+
+
+def test_resolve_target_ip_literals(monkeypatch):
+    from port_scanner import utils
+
+    def fail_getaddrinfo(*args, **kwargs):
+        raise AssertionError("IP literals must not hit the resolver")
+
+    monkeypatch.setattr(utils.socket, "getaddrinfo", fail_getaddrinfo)
+    assert utils.resolve_target("127.0.0.1") == "127.0.0.1"
+    assert utils.resolve_target("::1") == "::1"
+    assert utils.resolve_target("fe80::1") == "fe80::1"
+
+
+def test_save_csv_rows(tmp_path):
+    import csv
+
+    data = [
+        {"port": 22, "status": "open", "service": "ssh", "banner": "SSH-2.0-Test\r\nextra"},
+        {"port": 80, "status": "closed", "service": None, "banner": None},
+    ]
+    csv_file = tmp_path / "out.csv"
+    save_csv(data, str(csv_file))
+
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ["port", "status", "service", "banner"],
+        ["22", "open", "ssh", "SSH-2.0-Test  extra"],
+        ["80", "closed", "", ""],
+    ]
+
+
+def test_dumps_json_without_orjson(monkeypatch):
+    from port_scanner import utils
+
+    data = [{"port": 22, "status": "open", "service": "ssh", "banner": "café"}]
+    monkeypatch.setattr(utils, "orjson", None)
+    assert json.loads(utils.dumps_json(data).decode("utf-8")) == data
+
+
+def test_results_from_columns():
+    from port_scanner.utils import results_from_columns
+
+    columns = {
+        "port": [22, 80],
+        "status": ["open", "closed"],
+        "banner": ["SSH-2.0-Test", None],
+        "service": ["ssh", None],
+    }
+    assert results_from_columns(columns) == [
+        {"port": 22, "status": "open", "banner": "SSH-2.0-Test", "service": "ssh"},
+        {"port": 80, "status": "closed", "banner": None, "service": None},
+    ]
+    assert list(results_from_columns(columns)[0]) == ["port", "status", "banner", "service"]
+
+
+def test_infer_services_batch_matches_infer_service():
+    from port_scanner.utils import infer_service, infer_services_batch
+
+    ports = [22, 2222, 8000, 3307, 9999, 9998]
+    banners = [None, "SSH-2.0-OpenSSH_9.6", "Server: Apache", "MariaDB", "hello", None]
+    assert infer_services_batch(ports, banners) == [infer_service(p, b) for p, b in zip(ports, banners)]
+    assert infer_services_batch([], []) == []